@@ -34,8 +34,10 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "beautifulsoup4>=4.9.3",
+        "lxml>=4.6.0",
         "python-docx>=0.8.11",
         "requests>=2.25.1",
+        "orjson>=3.6.0",
         "click>=8.0.0",
         "typing-extensions>=4.0.0",
         "colorlog>=6.7.0",
@@ -1,13 +1,15 @@
 """Command-line interface for Box document conversion."""
 from typing import Optional
+import logging
 import click
 from pathlib import Path
 
-from .convertor import BoxNoteConverter
 from .utils.logger import setup_logger
 from .utils.constants import DEFAULT_OUTPUT_DIR
 
-logger = setup_logger()
+# Named explicitly so messages stay under the configured "boxtodocx" logger
+# when run as `python -m boxtodocx.cli`, where __name__ is "__main__"
+logger = logging.getLogger("boxtodocx.cli")
 
 @click.argument(
     "input_path",
@@ -67,6 +69,12 @@ logger = setup_logger()
     default=False,
     help="Process all Box documents in a directory"
 )
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes for --directory (0 = one per CPU)"
+)
 @click.option(
     "--api-token",
     help="Box API token for direct download"
@@ -93,6 +101,7 @@ def main(
     mfa_btn_id: Optional[str],
     mfa_otp: Optional[str],
     directory: bool,
+    jobs: int,
     generate_html: bool
 ) -> None:
     """
@@ -101,7 +110,11 @@ def main(
     Args:
         input_path: Path to Box document or directory
     """
+    setup_logger()
     try:
+        # Imported here so --help and usage errors skip the docx/selenium import graph
+        from .convertor import BoxNoteConverter
+        
         credentials = None
         if export_images and not api_token:
             if not all([box_id, box_pwd, link, id, pwd]):
@@ -130,7 +143,8 @@ def main(
                 credentials=credentials,
                 api_token=api_token,
                 generate_html=generate_html,
-                export_images=export_images
+                export_images=export_images,
+                jobs=jobs
             )
             logger.info(f"Processed {len(results)} files in {input_path}")
             
@@ -147,11 +161,13 @@ def main(
                 api_token=api_token,
                 generate_html=generate_html
             )
-            logger.info(f"Converted {input_path} to:")
-            logger.info(f"  HTML: {html_path}")
-            logger.info(f"  DOCX: {docx_path}")
+            # convert() already logs the one-line summary; full paths are detail
+            logger.debug("Converted %s to:", input_path)
+            if generate_html:
+                logger.debug("  HTML: %s", html_path)
+            logger.debug("  DOCX: %s", docx_path)
             if image_paths:
-                logger.info(f"  Images: {len(image_paths)} files")
+                logger.debug("  Images: %d files", len(image_paths))
                 
     except Exception as e:
         logger.error(str(e))
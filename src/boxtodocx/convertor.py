@@ -1,18 +1,90 @@
 """Core converter for Box documents to HTML and DOCX formats."""
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-import json
+from functools import lru_cache
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+import orjson
 
 from .handlers.html_handler import HTMLHandler
 from .handlers.docx_handler import DOCXHandler
 from .utils.logger import setup_logger
-from .utils.constants import DEFAULT_OUTPUT_DIR
+from .utils.constants import DEFAULT_OUTPUT_DIR, VALID_EXTENSIONS
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=16)
+def _parse_boxnote(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a Box note file; mtime and size are part of the cache key."""
+    return orjson.loads(Path(path).read_bytes())
+
+def _load_boxnote(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a Box note, reusing the parsed JSON while the file is unchanged.
+    
+    Validation and conversion of the same file then share a single parse.
+    Callers must treat the returned data as read-only.
+    """
+    stat = os.stat(filepath)
+    return _parse_boxnote(str(filepath), stat.st_mtime_ns, stat.st_size)
+
+def _iter_boxnotes(root: Path) -> Iterator[Path]:
+    """
+    Yield Box note files under root, recursively.
+    
+    Uses os.scandir so entries are filtered by name without a stat() call
+    per file, which pathlib's rglob() pays on large or network-mounted trees.
+    Directories that cannot be read are logged and skipped.
+    """
+    extensions = tuple(VALID_EXTENSIONS)
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {directory}: {str(e)}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(extensions) and entry.is_file():
+                    yield Path(entry.path)
+
+# Converter owned by each worker process of a parallel directory run
+_worker_converter: Optional['BoxNoteConverter'] = None
+
+def _init_worker(output_dir: str, configure_logging: bool) -> None:
+    """Create the converter used by this worker process."""
+    global _worker_converter
+    if configure_logging:
+        # No-op for forked workers, which inherit the parent's handlers
+        setup_logger()
+    _worker_converter = BoxNoteConverter(output_dir)
+
+def _convert_in_worker(
+    filepath: Path,
+    credentials: Optional[Dict[str, str]],
+    api_token: Optional[str],
+    generate_html: bool
+) -> Tuple[Optional[Path], Path, List[Path]]:
+    """Convert a single file inside a worker process."""
+    return _worker_converter.convert(
+        filepath,
+        credentials=credentials,
+        api_token=api_token,
+        generate_html=generate_html
+    )
 
 class BoxNoteConverter:
     """Converts Box documents to HTML and DOCX formats."""
     
+    __slots__ = ('output_dir', '_output_dir_ready', 'docx_handler')
+    
     def __init__(self, output_dir: Union[str, Path] = DEFAULT_OUTPUT_DIR) -> None:
         """
         Initialize converter with output directory.
@@ -21,11 +93,8 @@ class BoxNoteConverter:
             output_dir: Directory for output files
         """
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.base_output_dir = Path(output_dir)
-        self.html_handler = None  # Initialize only when needed
+        self._output_dir_ready = False
         self.docx_handler = DOCXHandler()
-        self.browser_initialized = False
     
     def convert(
         self,
@@ -35,25 +104,36 @@ class BoxNoteConverter:
         generate_html: bool = True,
         html_handler: Optional[HTMLHandler] = None,
         reuse_browser: bool = False
-    ) -> Tuple[Path, Path, List[Path]]:
-        """Convert a Box document to HTML and DOCX."""
+    ) -> Tuple[Optional[Path], Path, List[Path]]:
+        """
+        Convert a Box document to HTML and DOCX.
+        
+        Returns:
+            Tuple of (HTML path or None when HTML is not kept, DOCX path, image paths).
+            Images downloaded only to build the DOCX are deleted once it is
+            written, so their paths are not returned.
+        """
         filepath = Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Input file not found: {filepath}")
+        self._ensure_output_dir()
         
         temp_dir = None
         local_html_handler = None
         
         try:
             # Set up all paths
-            docx_path, assets_dir, html_path = self._setup_paths(filepath, generate_html)
-            if not generate_html:
+            download_images = bool(credentials or api_token or (html_handler and reuse_browser))
+            docx_path, assets_dir, html_path = self._setup_paths(
+                filepath, generate_html, download_images
+            )
+            if not generate_html and download_images:
                 temp_dir = assets_dir
                 
             # Use existing handler or create new one
             if html_handler and reuse_browser:
-                # Update output directory for existing handler
-                html_handler.output_dir = assets_dir
+                # Point the shared handler and its images at this file's assets
+                html_handler.retarget(assets_dir)
                 handler = html_handler
             else:
                 # Create new handler
@@ -61,14 +141,10 @@ class BoxNoteConverter:
                 if api_token:
                     handler.set_api_token(api_token)
                 local_html_handler = handler
-                
-            # Ensure image directory is within the assets directory
-            handler.image_manager.output_dir = assets_dir / "images"
             
             # Process file
             try:
-                with open(str(filepath), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_boxnote(filepath)
                     
                 html_content, image_paths = handler.convert_to_html(
                     data['doc']['content'],
@@ -76,87 +152,90 @@ class BoxNoteConverter:
                     api_token
                 )
                 
-                # Write HTML file
-                with open(str(html_path), 'w', encoding='utf-8') as f:
-                    f.write(html_content)
+                # Write HTML file only when requested; DOCX is built from the string
+                if html_path is not None:
+                    with open(str(html_path), 'w', encoding='utf-8') as f:
+                        f.write(html_content)
                 
-                # Convert to DOCX
-                docx_handler = DOCXHandler()
-                docx_handler.convert_html_to_docx(
-                    html_content,
-                    str(docx_path),
-                    str(assets_dir)
-                )
+                # Convert to DOCX, reusing the converter's handler
+                try:
+                    self.docx_handler.convert_html_to_docx(
+                        html_content,
+                        str(docx_path),
+                        str(assets_dir)
+                    )
+                finally:
+                    self.docx_handler.reset()
                 
+                logger.info(f"Converted {filepath.name} -> {docx_path.name}")
+                if temp_dir:
+                    # The images are removed with temp_dir below
+                    image_paths = []
                 return html_path, docx_path, image_paths
                 
             finally:
                 # Only cleanup if we created a new handler and aren't reusing
                 if local_html_handler and not reuse_browser:
                     local_html_handler.cleanup()
+                if temp_dir:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
                     
         except Exception as e:
             logger.error(f"Conversion failed for {filepath}: {str(e)}")
             raise
 
-    def _setup_output_dirs(self, input_path: Path) -> Tuple[Path, Path, Path]:
-        """
-        Set up output directories for a given input file.
-        
-        Args:
-            input_path: Path to input file
-            
-        Returns:
-            Tuple of (docx_path, html_dir, html_path)
-        """
-        # DOCX goes next to the input file
-        docx_path = input_path.with_suffix('.docx')
-        
-        # Create a folder with the same name as the boxnote for HTML and images
-        html_dir = input_path.parent / input_path.stem
-        html_dir.mkdir(parents=True, exist_ok=True)
-        
-        # HTML file path inside the folder
-        html_path = html_dir / input_path.with_suffix('.html').name
-        
-        logger.debug(f"Set up paths - DOCX: {docx_path}, HTML Dir: {html_dir}, HTML: {html_path}")
-        return docx_path, html_dir, html_path
+    def _ensure_output_dir(self) -> None:
+        """Create the output directory on first use rather than at construction."""
+        if not self._output_dir_ready:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
     
-    def _setup_paths(self, input_path: Path, generate_html: bool = True) -> Tuple[Path, Path, Path]:
+    def _setup_paths(
+        self,
+        input_path: Path,
+        generate_html: bool = True,
+        download_images: bool = False
+    ) -> Tuple[Path, Path, Optional[Path]]:
         """
         Set up all output paths for a given input file.
         
         Args:
             input_path: Path to Box note file
-            generate_html: If True, create permanent HTML/images, else use temp directory
+            generate_html: If True, create permanent HTML/images
+            download_images: If True and HTML is not kept, download images
+                into a temporary directory removed after conversion
 
         Returns:
-            Tuple of (docx_path, assets_dir, html_path)
+            Tuple of (docx_path, assets_dir, html_path); html_path is None
+            when HTML is not kept
         """
-        import tempfile
+        parent = input_path.parent
+        stem = input_path.stem
+        
         # DOCX goes next to the original file
-        docx_path = input_path.with_suffix('.docx')
+        docx_path = parent / f"{stem}.docx"
         
         if generate_html:
-            # Create permanent directory structure
-            assets_dir = input_path.parent / input_path.stem
-            assets_dir.mkdir(parents=True, exist_ok=True)
-            html_path = assets_dir / input_path.with_suffix('.html').name
-            
-            # Create images folder
+            # Create permanent directory structure with its images folder
+            assets_dir = parent / stem
+            html_path = assets_dir / f"{stem}.html"
             (assets_dir / 'images').mkdir(parents=True, exist_ok=True)
-        else:
-            # Create temporary directory that will be automatically cleaned up
-            temp_dir = tempfile.mkdtemp(prefix='boxnote_')
-            assets_dir = Path(temp_dir)
-            html_path = assets_dir / input_path.with_suffix('.html').name
+        elif download_images:
+            # Temporary directory for downloaded images, removed by convert()
+            assets_dir = Path(tempfile.mkdtemp(prefix='boxnote_'))
+            html_path = None
             
             # Create images folder in temp directory
             (assets_dir / 'images').mkdir(parents=True, exist_ok=True)
+        else:
+            # HTML stays in memory and no images are fetched, so nothing
+            # besides the DOCX is written
+            assets_dir = parent
+            html_path = None
             
-        logger.info(f"Processing {input_path.name}:")
-        logger.info(f"- DOCX will be created at: {docx_path}")
-        logger.info(f"- Assets directory: {assets_dir}")
+        logger.debug(
+            "Processing %s: DOCX at %s, assets in %s", input_path.name, docx_path, assets_dir
+        )
         
         return docx_path, assets_dir, html_path
 
@@ -166,15 +245,28 @@ class BoxNoteConverter:
         credentials: Optional[Dict[str, str]] = None,
         api_token: Optional[str] = None,
         generate_html: bool = True,
-        export_images: bool = False
-    ) -> List[Tuple[Path, Path, List[Path]]]:
-        """Convert all Box documents in a directory recursively."""
+        export_images: bool = False,
+        jobs: int = 1
+    ) -> List[Tuple[Optional[Path], Path, List[Path]]]:
+        """
+        Convert all Box documents in a directory recursively.
+        
+        Args:
+            directory: Directory to search for .boxnote files
+            credentials: Optional Box credentials for image download
+            api_token: Optional Box API token for direct download
+            generate_html: Keep HTML and images next to each DOCX
+            export_images: Download images referenced by the notes
+            jobs: Number of worker processes; 0 uses one per CPU. Runs that
+                log into Box through the browser always convert serially.
+        """
         directory = Path(directory)
         if not directory.exists():
             raise FileNotFoundError(f"Directory not found: {directory}")
+        self._ensure_output_dir()
         
         results = []
-        boxnotes = list(directory.rglob('*.boxnote'))
+        boxnotes = list(_iter_boxnotes(directory))
         
         if not boxnotes:
             logger.warning(f"No .boxnote files found in {directory}")
@@ -182,6 +274,12 @@ class BoxNoteConverter:
             
         logger.info(f"Found {len(boxnotes)} .boxnote files in {directory}")
         
+        # The selenium session cannot be shared across processes
+        if jobs != 1 and not (export_images and credentials):
+            return self._convert_parallel(
+                boxnotes, credentials, api_token, generate_html, jobs or os.cpu_count()
+            )
+        
         shared_html_handler = None
         try:
             # Initialize HTML handler only once if needed
@@ -202,7 +300,6 @@ class BoxNoteConverter:
                         reuse_browser=True  # Indicate we're reusing the browser
                     )
                     results.append(result)
-                    logger.info(f"Successfully converted: {filepath.name}")
                 except Exception as e:
                     logger.error(f"Failed to convert {filepath.name}: {str(e)}")
                     continue
@@ -214,6 +311,34 @@ class BoxNoteConverter:
                 logger.info("Cleaned up browser session")
         
         return results
+    
+    def _convert_parallel(
+        self,
+        boxnotes: List[Path],
+        credentials: Optional[Dict[str, str]],
+        api_token: Optional[str],
+        generate_html: bool,
+        jobs: int
+    ) -> List[Tuple[Optional[Path], Path, List[Path]]]:
+        """Convert files in a process pool, returning results in input order."""
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(str(self.output_dir), bool(logging.getLogger("boxtodocx").handlers))
+        ) as executor:
+            futures = [
+                executor.submit(_convert_in_worker, filepath, credentials, api_token, generate_html)
+                for filepath in boxnotes
+            ]
+            for filepath, future in zip(boxnotes, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to convert {filepath.name}: {str(e)}")
+        
+        return results
+    
     @staticmethod
     def validate_boxnote(filepath: Union[str, Path]) -> bool:
         """
@@ -226,8 +351,7 @@ class BoxNoteConverter:
             True if valid, False otherwise
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_boxnote(filepath)
                 
             if not isinstance(data, dict):
                 return False
@@ -240,5 +364,5 @@ class BoxNoteConverter:
                 
             return True
             
-        except (json.JSONDecodeError, OSError):
+        except (orjson.JSONDecodeError, OSError):
             return False
\ No newline at end of file
@@ -1,17 +1,22 @@
 """Handler for converting HTML content to DOCX format."""
-from typing import Dict, Optional, Union
+from typing import Dict, FrozenSet, Optional, Tuple, Union
 from pathlib import Path
+from functools import lru_cache
+import logging
+import os
 import re
+from xml.sax.saxutils import escape
 from bs4 import BeautifulSoup
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.oxml.shape import CT_Inline
+from docx.styles.style import BaseStyle
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from PIL import Image
-from ..utils.logger import setup_logger
 from ..utils.constants import (
     DEFAULT_TABLE_STYLE,
     DEFAULT_IMAGE_WIDTH,
@@ -19,16 +24,103 @@ from ..utils.constants import (
     DEFAULT_FONT_NAME
 )
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
+
+# lxml is a declared dependency; fall back to the stdlib parser if it is missing
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+_HEX_COLOR_RE = re.compile(r'^#?([0-9a-f]{6})$')
+_STYLE_DECL_RE = re.compile(r'\s*([a-zA-Z-]+)\s*:\s*([^;]+?)\s*(?:;|$)')
+
+# Run formatting flags accumulated from nested inline tags
+_BOLD, _ITALIC, _UNDERLINE = 1, 2, 4
+_INLINE_FORMATS = {
+    'strong': _BOLD,
+    'b': _BOLD,
+    'em': _ITALIC,
+    'i': _ITALIC,
+    'u': _UNDERLINE
+}
+
+# Characters run.text turns into <w:tab/>/<w:br/>; text containing them gets
+# a run of its own instead of a raw <w:t> appended to the previous one
+_RUN_BREAK_CHARS = frozenset('\t\n\r')
+
+_ALIGNMENTS = {
+    'left': WD_ALIGN_PARAGRAPH.LEFT,
+    'center': WD_ALIGN_PARAGRAPH.CENTER,
+    'right': WD_ALIGN_PARAGRAPH.RIGHT,
+    'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
+}
+
+# Block wrappers without a handler of their own; their children are
+# processed in place instead of being dropped
+_CONTAINER_TAGS = frozenset({
+    'div', 'blockquote', 'section', 'article', 'main', 'header', 'footer'
+})
+
+_CELL_TAGS = frozenset({'td', 'th'})
+
+# h1 -> 'Heading 1', h2 -> 'Heading 2', etc.
+_HEADING_STYLES = {f'h{level}': f'Heading {level}' for level in range(1, 7)}
+
+# Hyperlink run (blue, single underline) parsed in one call per link
+_HYPERLINK_XML = (
+    '<w:hyperlink ' + nsdecls('w', 'r') + ' r:id="{r_id}">'
+    '<w:r><w:rPr><w:color w:val="0000FF"/><w:u w:val="single"/></w:rPr>'
+    '<w:t xml:space="preserve">{text}</w:t></w:r>'
+    '</w:hyperlink>'
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_style(style: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Parse an inline CSS style string into lowercased property/value pairs.
+
+    Box notes repeat the same style strings across many elements, so results
+    are cached; a tuple is returned so cached entries cannot be mutated.
+    """
+    return tuple(
+        (prop.lower(), value.lower()) for prop, value in _STYLE_DECL_RE.findall(style)
+    )
+
+
+@lru_cache(maxsize=512)
+def _hex_to_rgbcolor(hex_color: str) -> RGBColor:
+    """Convert a six-digit hex string (without '#') to a cached RGBColor."""
+    return RGBColor(*bytes.fromhex(hex_color))
+
 
 class DOCXHandler:
     """Handles conversion of HTML content to DOCX format."""
     
+    __slots__ = (
+        'output_dir', 'document', 'assets_dir', '_sentinel', '_dir_listings',
+        '_images', '_last_run', '_last_run_key', '_link_rids',
+        '_styles'
+    )
+    
     def __init__(self) -> None:
         """Initialize DOCX handler."""
-        self.document = Document()
         self.output_dir: Optional[Path] = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Start a new document so the handler can be reused for another file."""
+        self.document = Document()
         self.assets_dir: Optional[Path] = None
+        self._sentinel: Optional[Paragraph] = None
+        self._dir_listings: Dict[Path, FrozenSet[str]] = {}
+        self._images: Dict[Path, Tuple[str, str, int, int]] = {}
+        self._link_rids: Dict[str, str] = {}
+        self._styles: Dict[str, BaseStyle] = {}
+        self._last_run: Optional[Run] = None
+        self._last_run_key: Optional[Tuple[int, Tuple[str, ...]]] = None
         self._setup_document()
     
     def _setup_document(self) -> None:
@@ -56,17 +148,26 @@ class DOCXHandler:
         try:
             output_path = Path(output_path)
             self.assets_dir = Path(assets_dir) if assets_dir else output_path.parent
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
             
             if not soup.body:
                 raise ValueError("Invalid HTML: no body tag found")
                 
-            self._process_elements(soup.body)
+            # New blocks are inserted before a trailing sentinel paragraph:
+            # Document.add_paragraph() scans the body for <w:sectPr> on every
+            # call, which makes building long documents quadratic.
+            self._sentinel = self.document.add_paragraph()
+            try:
+                self._process_elements(soup.body)
+            finally:
+                sentinel = self._sentinel._p
+                sentinel.getparent().remove(sentinel)
+                self._sentinel = None
             
             output_path.parent.mkdir(parents=True, exist_ok=True)
             self.document.save(str(output_path))
             
-            logger.info(f"Created DOCX file: {output_path}")
+            logger.debug("Created DOCX file: %s", output_path)
             return output_path
             
         except Exception as e:
@@ -74,162 +175,207 @@ class DOCXHandler:
             raise
     
     def _process_elements(self, parent: BeautifulSoup) -> None:
-        """Process HTML elements recursively."""
-        for element in parent.children:
-            if not hasattr(element, 'name'):
-                continue
-                
-            # Add logging to track element processing
-            if element.name:
-                logger.debug(f"Processing element: {element.name}")  # Add this line
-                
-            handler = self._element_handlers.get(element.name)
-            if handler:
-                handler(self, element)
-                if element.name == 'img':  # Add this line
-                    logger.info(f"Processed image element: {element}")  # Add this line
+        """Process block elements, walking container tags without recursion."""
+        get_handler = self._element_handlers.get
+        stack = [iter(parent.children)]
+        while stack:
+            for element in stack[-1]:
+                name = element.name
+                if name is None:
+                    continue
+                    
+                handler = get_handler(name)
+                if handler:
+                    handler(self, element)
+                elif name in _CONTAINER_TAGS:
+                    # Descend; the parent's iterator resumes once this one is exhausted
+                    stack.append(iter(element.children))
+                    break
+                else:
+                    logger.debug("Unhandled element type: %s", name)
             else:
-                logger.debug(f"Unhandled element type: {element.name}")
+                stack.pop()
                 
+    def _new_paragraph(self, text: str = '', style: Optional[str] = None) -> Paragraph:
+        """Insert a new paragraph at the end of the document body."""
+        if style is None:
+            return self._sentinel.insert_paragraph_before(text)
+        # Resolve each style name once per document; lookups by name search the styles XML
+        style_obj = self._styles.get(style)
+        if style_obj is None:
+            style_obj = self._styles[style] = self.document.styles[style]
+        return self._sentinel.insert_paragraph_before(text, style_obj)
+    
     def _handle_paragraph(self, element: BeautifulSoup) -> None:
         """Handle paragraph element."""
-        p = self.document.add_paragraph()
+        p = self._new_paragraph()
         self._apply_styles(element, p)
         self._process_inline_elements(element, p)
     
     def _handle_heading(self, element: BeautifulSoup) -> None:
         """Handle heading element."""
-        level = int(element.name[1])  # h1 -> 1, h2 -> 2, etc.
-        self.document.add_heading(element.get_text(), level=level)
+        self._new_paragraph(element.get_text(), style=_HEADING_STYLES[element.name])
     
     def _handle_list(self, element: BeautifulSoup, ordered: bool = False) -> None:
         """Handle list element."""
         style = 'List Number' if ordered else 'List Bullet'
-        for item in element.find_all('li', recursive=False):
-            p = self.document.add_paragraph(style=style)
+        for item in element.children:
+            if item.name != 'li':
+                continue
+            p = self._new_paragraph(style=style)
             self._process_inline_elements(item, p)
     
     def _handle_table(self, element: BeautifulSoup) -> None:
         """Handle table element."""
-        rows = element.find_all('tr', recursive=False)
+        # Collect cells in one pass over direct children
+        rows = [
+            [cell for cell in row.children if cell.name in _CELL_TAGS]
+            for row in element.children if row.name == 'tr'
+        ]
         if not rows:
             return
             
-        cols = max(len(row.find_all(['td', 'th'], recursive=False)) for row in rows)
+        cols = max(map(len, rows))
         table = self.document.add_table(rows=len(rows), cols=cols)
+        self._sentinel._p.addprevious(table._tbl)
         table.style = DEFAULT_TABLE_STYLE
         
-        for i, row in enumerate(rows):
-            cells = row.find_all(['td', 'th'], recursive=False)
+        # Table.cell(i, j) rebuilds the full cell list on every call
+        table_cells = table._cells
+        for i, cells in enumerate(rows):
             for j, cell in enumerate(cells):
-                table_cell = table.cell(i, j)
+                table_cell = table_cells[i * cols + j]
                 self._process_inline_elements(cell, table_cell.paragraphs[0])
     
-    def _handle_image(self, element: BeautifulSoup) -> None:
-        """Handle image element."""
+    def _handle_image(self, element: BeautifulSoup, paragraph: Optional[Paragraph] = None) -> None:
+        """
+        Handle image element.
+        
+        Images inside a paragraph are added to it as a run; top-level images
+        get a paragraph of their own followed by a spacer.
+        """
         try:
-            logger.info("Image handler called")  # Add this line
             src = element.get('src')
-            logger.info(f"Image src: {src}")  # Add this line
-            
             if not src:
                 logger.warning("No src attribute found in image element")
                 return
 
             img_path = self.assets_dir / src
-            logger.info(f"Looking for image at: {img_path}")  # Add this line
-            
-            if img_path.exists():
-                logger.info(f"Found image file at: {img_path}")  # Add this line
-                # Add image to document
-                self.document.add_picture(str(img_path), width=Inches(6))
-                self.document.add_paragraph()  # Add spacing after image
-                logger.info("Successfully added image to document")  # Add this line
+            if self._file_exists(img_path):
+                if paragraph is not None:
+                    self._add_picture(paragraph.add_run(), img_path)
+                else:
+                    self._add_picture(self._new_paragraph().add_run(), img_path)
+                    self._new_paragraph()  # Add spacing after image
+                logger.debug("Added image %s", img_path)
             else:
                 logger.error(f"Image file not found: {img_path}")
 
-        except Exception as e:
-            logger.error(f"Error in image handling: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())  # Add full traceback
+        except Exception:
+            logger.exception("Error in image handling")
+    
+    def _add_picture(self, run: Run, img_path: Path) -> None:
+        """Add a picture to a run, reading each image file once per document."""
+        part = self.document.part
+        cached = self._images.get(img_path)
+        if cached is None:
+            r_id, image = part.get_or_add_image(str(img_path))
+            # Scale down to the default width but never enlarge small images
+            width = min(Inches(DEFAULT_IMAGE_WIDTH), image.width)
+            cached = (r_id, image.filename, *image.scaled_dimensions(width))
+            self._images[img_path] = cached
+        r_id, filename, cx, cy = cached
+        run._r.add_drawing(CT_Inline.new_pic_inline(part.next_id, r_id, filename, cx, cy))
+    
+    def _file_exists(self, path: Path) -> bool:
+        """Check for a file against a listing of its directory read once per document."""
+        parent = path.parent
+        names = self._dir_listings.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent) as entries:
+                    names = frozenset(entry.name for entry in entries if entry.is_file())
+            except OSError:
+                names = frozenset()
+            self._dir_listings[parent] = names
+        return path.name in names
     
     def _process_inline_elements(
         self,
         element: BeautifulSoup,
-        paragraph: Paragraph
+        paragraph: Paragraph,
+        formats: int = 0,
+        styled: Tuple[BeautifulSoup, ...] = (),
+        nested: bool = False
     ) -> None:
-        """Process inline elements within a paragraph."""
+        """
+        Process inline elements within a paragraph.
+        
+        Formatting from nested inline tags is accumulated in ``formats`` and
+        ``styled`` so every text node becomes a single run with all of its
+        formatting applied at once. Adjacent text with the same formatting is
+        merged into the preceding run.
+        """
+        get_handler = self._inline_handlers.get
         for child in element.children:
-            if not hasattr(child, 'name') or child.name is None:
+            name = child.name
+            if name is None:
                 # Handle pure text nodes
-                if str(child).strip():  # Only add non-empty text
-                    run = paragraph.add_run(str(child))
+                # isspace() avoids allocating a stripped copy of every text node
+                if not child or (not nested and child.isspace()):  # Only add non-empty text
+                    continue
+                key = (formats, tuple(styled_element['style'] for styled_element in styled))
+                last = self._last_run
+                if (last is not None and key == self._last_run_key
+                        and not _RUN_BREAK_CHARS.intersection(child)):
+                    # Extend the previous run when nothing was added after it.
+                    # A further <w:t> keeps the cost proportional to the new
+                    # text; rewriting run.text would copy the whole run again.
+                    p = paragraph._p
+                    if len(p) and p[-1] is last._r:
+                        last.add_text(str(child))
+                        continue
+                run = paragraph.add_run(str(child))
+                self._last_run = run
+                self._last_run_key = key
+                if formats & _BOLD:
+                    run.bold = True
+                if formats & _ITALIC:
+                    run.italic = True
+                if formats & _UNDERLINE:
+                    run.underline = True
+                for styled_element in styled:
+                    self._apply_styles(styled_element, run)
                 continue
             
-            # Add this block to handle images inside paragraphs
-            if child.name == 'img':
-                logger.info("Found image in paragraph")
-                self._handle_image(child)
-                continue
-                
-            # Handle other element nodes
-            if child.name == 'a':
-                self._add_hyperlink(paragraph, child.get('href', '#'), child.get_text())
-            elif child.name in ['strong', 'b']:
-                run = paragraph.add_run(child.get_text())
-                run.bold = True
-            elif child.name in ['em', 'i']:
-                run = paragraph.add_run(child.get_text())
-                run.italic = True
-            elif child.name == 'u':
-                run = paragraph.add_run(child.get_text())
-                run.underline = True
-            elif child.name == 'br':
-                paragraph.add_run().add_break()
+            handler = get_handler(name)
+            if handler:
+                handler(self, child, paragraph)
             else:
-                run = paragraph.add_run(child.get_text())
-            
-            # Only apply styles to element nodes
-            if child.name:
-                self._apply_styles(child, run if 'run' in locals() else None)
+                # Formatting and wrapper tags: recurse with accumulated formatting
+                self._process_inline_elements(
+                    child,
+                    paragraph,
+                    formats | _INLINE_FORMATS.get(name, 0),
+                    styled + (child,) if child.get('style') else styled,
+                    nested=True
+                )
     
     def _add_hyperlink(self, paragraph: Paragraph, url: str, text: str) -> None:
         """Add hyperlink to paragraph with proper formatting."""
         try:
-            part = paragraph.part
-            r_id = part.relate_to(url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
-            
-            # Create hyperlink element
-            hyperlink = OxmlElement('w:hyperlink')
-            hyperlink.set(qn('r:id'), r_id)
-            
-            # Create run element
-            run = OxmlElement('w:r')
-            
-            # Add style to run
-            rPr = OxmlElement('w:rPr')
-            
-            # Add color
-            color = OxmlElement('w:color')
-            color.set(qn('w:val'), '0000FF')  # Blue color
-            rPr.append(color)
-            
-            # Add underline
-            underline = OxmlElement('w:u')
-            underline.set(qn('w:val'), 'single')
-            rPr.append(underline)
-            
-            run.append(rPr)
+            # relate_to scans every existing relationship, so reuse ids for repeated links
+            r_id = self._link_rids.get(url)
+            if r_id is None:
+                part = paragraph.part
+                r_id = part.relate_to(url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
+                self._link_rids[url] = r_id
             
-            # Add text element
-            t = OxmlElement('w:t')
-            t.text = text
-            run.append(t)
+            paragraph._p.append(parse_xml(
+                _HYPERLINK_XML.format(r_id=r_id, text=escape(text))
+            ))
             
-            hyperlink.append(run)
-            paragraph._p.append(hyperlink)
-            
-            logger.debug(f"Added hyperlink: {text} -> {url}")
+            logger.debug("Added hyperlink: %s -> %s", text, url)
             
         except Exception as e:
             logger.error(f"Error adding hyperlink: {str(e)}")
@@ -244,31 +390,23 @@ class DOCXHandler:
         """Apply HTML styles to paragraph or run."""
         # Only process elements with 'style' attribute
         style = element.get('style')
-        if not style or not isinstance(style, str):
+        if not style or not isinstance(style, str) or ':' not in style:
+            return
+        # Substring checks skip styles with nothing we apply; property names
+        # are case-insensitive, so only trust them for all-lowercase styles
+        if 'color' not in style and 'text-align' not in style and style.islower():
             return
         
-        for declaration in style.split(';'):
-            if ':' not in declaration:
-                continue
-            
-            prop, value = declaration.split(':')
-            prop = prop.strip().lower()
-            value = value.strip().lower()
-            
-            if prop == 'color' and isinstance(target, Run):
-                if m := re.match(r'^#?([0-9a-f]{6})$', value):
-                    hex_color = m.group(1)
-                    r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                    target.font.color.rgb = RGBColor(r, g, b)
-            elif prop == 'text-align' and isinstance(target, Paragraph):
-                alignments = {
-                    'left': WD_ALIGN_PARAGRAPH.LEFT,
-                    'center': WD_ALIGN_PARAGRAPH.CENTER,
-                    'right': WD_ALIGN_PARAGRAPH.RIGHT,
-                    'justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-                }
-                if value in alignments:
-                    target.alignment = alignments[value]
+        # The target type is fixed for the whole call
+        is_run = isinstance(target, Run)
+        is_paragraph = not is_run and isinstance(target, Paragraph)
+        for prop, value in _parse_style(style):
+            if prop == 'color' and is_run:
+                if m := _HEX_COLOR_RE.match(value):
+                    target.font.color.rgb = _hex_to_rgbcolor(m.group(1))
+            elif prop == 'text-align' and is_paragraph:
+                if value in _ALIGNMENTS:
+                    target.alignment = _ALIGNMENTS[value]
     
     _element_handlers = {
         'p': _handle_paragraph,
@@ -282,4 +420,10 @@ class DOCXHandler:
         'ol': lambda self, e: self._handle_list(e, True),
         'table': _handle_table,
         'img': _handle_image
+    }
+    
+    _inline_handlers = {
+        'img': lambda self, e, p: self._handle_image(e, p),
+        'a': lambda self, e, p: self._add_hyperlink(p, e.get('href', '#'), e.get_text()),
+        'br': lambda self, e, p: p.add_run().add_break()
     }
\ No newline at end of file
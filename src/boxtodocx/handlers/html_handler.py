@@ -1,18 +1,20 @@
 """Handler for converting Box documents to HTML format."""
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from pathlib import Path
-import json, os
-import requests
+import logging
+import os
+import orjson
 from requests.exceptions import RequestException
 
 from ..mappers.html_mapper import HTMLMapper
-from ..utils.browser import BrowserManager
-from ..utils.image import ImageManager
+from ..utils.image import ImageManager, create_download_session
 from ..utils.box_api import BoxAPIClient
-from ..utils.logger import setup_logger
 from ..utils.constants import DEFAULT_OUTPUT_DIR
 
-logger = setup_logger(__name__)
+if TYPE_CHECKING:
+    from ..utils.browser import BrowserManager
+
+logger = logging.getLogger(__name__)
 
 class HTMLHandler:
     """Handles conversion of Box documents to HTML format."""
@@ -30,18 +32,27 @@ class HTMLHandler:
         self.browser_manager = None  # Initialize as None
         self.api_client = None
         
-    def set_browser_manager(self, browser_manager: Optional[BrowserManager]) -> None:
+    def set_browser_manager(self, browser_manager: Optional['BrowserManager']) -> None:
         """Set existing browser manager for reuse."""
         self.browser_manager = browser_manager
 
     def ensure_browser_initialized(self, credentials: Dict[str, str]) -> None:
         """Ensure browser is initialized and logged into Box."""
         if not self.browser_manager:
+            # Deferred so text-only conversions never import selenium
+            from ..utils.browser import BrowserManager
             self.browser_manager = BrowserManager()
             self.browser_manager.initialize_browser()
             self.browser_manager.authenticate_box(credentials)
             logger.info("Initialized and authenticated browser session")
 
+    def retarget(self, output_dir: Path) -> None:
+        """Point HTML and image output at a new directory if it changed."""
+        output_dir = Path(output_dir)
+        if output_dir != self.output_dir:
+            self.output_dir = output_dir
+            self.image_manager.output_dir = output_dir / "images"
+
     def set_api_token(self, api_token: str) -> None:
         """Set Box API token for direct downloads."""
         self.api_client = BoxAPIClient(api_token)
@@ -86,15 +97,14 @@ class HTMLHandler:
             
         Raises:
             FileNotFoundError: If input file doesn't exist
-            json.JSONDecodeError: If input file is invalid JSON
+            orjson.JSONDecodeError: If input file is invalid JSON
         """
         input_path = Path(input_path)
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
             
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = orjson.loads(input_path.read_bytes())
             
             if not isinstance(data, dict):
                 raise ValueError("Invalid BoxNote format: root must be an object")
@@ -106,15 +116,15 @@ class HTMLHandler:
             html_content, image_paths = self.convert_to_html(content, credentials, api_token)
             
             self.output_dir.mkdir(parents=True, exist_ok=True)
-            output_path = self.output_dir / input_path.with_suffix('.html').name
+            output_path = self.output_dir / f"{input_path.stem}.html"
             
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(html_content)
                 
-            logger.info(f"Created HTML file: {output_path}")
+            logger.debug("Created HTML file: %s", output_path)
             return output_path, image_paths
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in input file: {str(e)}")
             raise
         except Exception as e:
@@ -134,19 +144,13 @@ class HTMLHandler:
 
         try:
             # Only initialize browser if not already initialized
-            if credentials and not self.browser_manager:
-                self.browser_manager = BrowserManager()
-                self.browser_manager.initialize_browser()
-                self.browser_manager.authenticate_box(credentials)
+            if credentials:
+                self.ensure_browser_initialized(credentials)
                 
-            session = requests.Session()
+            session = create_download_session()
             if self.browser_manager and self.browser_manager.cookies:
                 for cookie in self.browser_manager.cookies:
                     session.cookies.set(cookie['name'], cookie['value'])
-                    
-            # Make sure image directory is within the current output directory
-            image_dir = self.output_dir / "images"
-            self.image_manager.output_dir = image_dir
 
             for url in image_urls:
                 try:
@@ -165,7 +169,7 @@ class HTMLHandler:
                             # Use path relative to current output directory
                             rel_path = local_path.relative_to(self.output_dir)
                             self.mapper.image_paths[url] = rel_path
-                            logger.debug(f"Added image mapping: {url} -> {rel_path}")
+                            logger.debug("Added image mapping: %s -> %s", url, rel_path)
                         
                 except Exception as e:
                     logger.error(f"Error processing image {url}: {str(e)}")
@@ -187,7 +191,7 @@ class HTMLHandler:
                 if result := self.image_manager.download_with_api(url, self.api_client):
                     local_path, filename = result
                     self.mapper.image_paths[url] = local_path.relative_to(self.output_dir)
-                    logger.info(f"Downloaded image via API: {filename}")
+                    logger.debug("Downloaded image via API: %s", filename)
                 else:
                     logger.warning(f"Failed to download image via API: {url}")
                     
@@ -196,35 +200,38 @@ class HTMLHandler:
        
 
     def _extract_image_urls(self, content: List[Dict]) -> List[str]:
-        """Extract image URLs from content recursively."""
+        """Extract image URLs from content in document order."""
         urls = []
+        append = urls.append
         
-        def extract(items: List[Dict]) -> None:
-            for item in items:
-                if item.get('type') == 'image' and 'attrs' in item:
-                    attrs = item['attrs']
-                    # Try different possible image source attributes
-                    url = attrs.get('src') or attrs.get('boxSharedLink') or attrs.get('url')
-                    if url:
-                        logger.debug(f"Found image URL: {url}")
-                        urls.append(url)
-                
-                # Handle legacy box_image format
-                elif item.get('type') == 'box_image' and 'attrs' in item:
-                    attrs = item['attrs']
-                    if file_id := attrs.get('file_id'):
-                        url = f"https://app.box.com/file/{file_id}"
-                        logger.debug(f"Found Box image ID: {file_id}")
-                        urls.append(url)
-                
-                # Recurse into content
-                if 'content' in item and isinstance(item['content'], list):
-                    extract(item['content'])
+        # Explicit pre-order stack; children are pushed reversed to keep order
+        stack = content[::-1]
+        pop = stack.pop
+        while stack:
+            item = pop()
+            item_type = item.get('type')
+            if item_type == 'image' and 'attrs' in item:
+                attrs = item['attrs']
+                # Try different possible image source attributes
+                url = attrs.get('src') or attrs.get('boxSharedLink') or attrs.get('url')
+                if url:
+                    logger.debug("Found image URL: %s", url)
+                    append(url)
+            
+            # Handle legacy box_image format
+            elif item_type == 'box_image' and 'attrs' in item:
+                attrs = item['attrs']
+                if file_id := attrs.get('file_id'):
+                    logger.debug("Found Box image ID: %s", file_id)
+                    append(f"https://app.box.com/file/{file_id}")
+            
+            children = item.get('content')
+            if isinstance(children, list):
+                stack.extend(reversed(children))
         
-        extract(content)
-        logger.info(f"Found {len(urls)} images")
+        logger.debug("Found %d images", len(urls))
         if urls:
-            logger.debug(f"Image URLs found: {urls}")
+            logger.debug("Image URLs found: %s", urls)
         return urls
     
     def cleanup(self) -> None:
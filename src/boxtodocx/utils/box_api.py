@@ -1,10 +1,16 @@
 """Box API utilities for downloading files."""
 from typing import Optional, Tuple
+import logging
 import requests
 from pathlib import Path
-from ..utils.logger import setup_logger
 import re
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
+
+_FILE_ID_PATTERNS = (
+    re.compile(r"box\.com/s/([a-zA-Z0-9]+)"),  # Shared link
+    re.compile(r"box\.com/file/(\d+)"),         # Direct file link
+    re.compile(r"^(\d+)$")                      # Raw file ID
+)
 
 class BoxAPIClient:
     """Client for interacting with Box API."""
@@ -21,7 +27,7 @@ class BoxAPIClient:
     def get_file_info(self, file_id: str) -> Optional[dict]:
         """Get file information from Box."""
         try:
-            logger.debug(f"Fetching info for file: {file_id}")
+            logger.debug("Fetching info for file: %s", file_id)
             response = requests.get(
                 f"{self.base_url}/files/{file_id}",
                 headers=self.headers
@@ -69,14 +75,7 @@ class BoxAPIClient:
     @staticmethod
     def extract_file_id_from_url(url: str) -> Optional[str]:
         """Extract Box file ID from URL."""
-        import re
-        patterns = [
-            r"box\.com/s/([a-zA-Z0-9]+)",  # Shared link
-            r"box\.com/file/(\d+)",         # Direct file link
-            r"^(\d+)$"                      # Raw file ID
-        ]
-        
-        for pattern in patterns:
-            if match := re.search(pattern, url):
+        for pattern in _FILE_ID_PATTERNS:
+            if match := pattern.search(url):
                 return match.group(1)
         return None
\ No newline at end of file
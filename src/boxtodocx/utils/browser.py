@@ -1,5 +1,6 @@
 """Browser management utilities for Box authentication and downloads."""
 from typing import Optional, Dict, Any
+import logging
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -18,9 +19,8 @@ from .constants import (
     BOX_AUTH_TIMEOUT,
     BOX_DOWNLOAD_TIMEOUT
 )
-from .logger import setup_logger
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
 
 class BrowserManager:
     """Manages browser instances for Box authentication and downloads."""
@@ -53,7 +53,7 @@ class BrowserManager:
                 self._initialized = True
                 return
             except WebDriverException as e:
-                logger.debug(f"Failed to initialize {browser_name}: {str(e)}")
+                logger.debug("Failed to initialize %s: %s", browser_name, e)
                 continue
                 
         raise RuntimeError("No supported browser could be initialized. Please install Chrome, Firefox, or Safari.")
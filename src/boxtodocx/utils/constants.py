@@ -34,6 +34,7 @@ DEFAULT_FONT_NAME: Final[str] = "Calibri"
 BOX_LOGIN_URL: Final[str] = "https://account.box.com/login"
 BOX_AUTH_TIMEOUT: Final[int] = 300  # seconds
 BOX_DOWNLOAD_TIMEOUT: Final[int] = 60  # seconds
+MAX_DOWNLOAD_WORKERS: Final[int] = 8  # concurrent image downloads
 
 # File extensions
 VALID_EXTENSIONS: Final[List[str]] = [".boxnote"]
@@ -1,22 +1,49 @@
 """Image handling utilities for downloading and processing Box images."""
-from typing import Optional, Dict, List, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
+import logging
 import os
 import time
 import hashlib, mimetypes, re
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..utils.box_api import BoxAPIClient
 from urllib.parse import urlparse
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
 
-from .constants import DEFAULT_IMAGE_DIR
-from .logger import setup_logger
+from .constants import DEFAULT_IMAGE_DIR, MAX_DOWNLOAD_WORKERS
 
-logger = setup_logger(__name__)
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp'})
+_JPEG_EXTENSIONS = frozenset({'.jpg', '.jpeg'})
+
+# Content-type to extension mappings; JPEG always uses .jpg
+_CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/bmp': '.bmp'
+}
+
+
+def create_download_session() -> requests.Session:
+    """Create a session with pooled connections and retries for image downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_DOWNLOAD_WORKERS,
+        pool_maxsize=MAX_DOWNLOAD_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 class ImageManager:
     """Manages image downloads and processing from Box."""
@@ -53,13 +80,13 @@ class ImageManager:
         """
         if filename:
             # Clean filename of invalid characters
-            clean_filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+            clean_filename = _INVALID_FILENAME_CHARS_RE.sub('', filename)
             
             # Ensure filename has correct extension
             current_ext = Path(clean_filename).suffix.lower()
-            if current_ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
+            if current_ext in _IMAGE_EXTENSIONS:
                 # If it's jpeg, standardize to jpg
-                if current_ext in ['.jpg', '.jpeg']:
+                if current_ext in _JPEG_EXTENSIONS:
                     clean_filename = clean_filename.rsplit('.', 1)[0] + '.jpg'
             else:
                 # Add extension if missing
@@ -90,24 +117,14 @@ class ImageManager:
         Returns:
             Appropriate file extension including the dot
         """
-        # Define extension mappings
-        content_type_mapping = {
-            'image/jpeg': '.jpg',  # Always use .jpg for JPEG images
-            'image/jpg': '.jpg',
-            'image/png': '.png',
-            'image/gif': '.gif',
-            'image/bmp': '.bmp'
-        }
-        
         # Try to get extension from content-type first
         if content_type:
             content_type = content_type.lower().split(';')[0]
-            if ext := content_type_mapping.get(content_type):
-                logger.debug(f"Using extension {ext} from content-type {content_type}")
+            if ext := _CONTENT_TYPE_EXTENSIONS.get(content_type):
+                logger.debug("Using extension %s from content-type %s", ext, content_type)
                 return ext
         
         # Try to get from URL path
-        from urllib.parse import urlparse
         path = urlparse(url).path.lower()
         
         # Handle known extensions
@@ -121,42 +138,65 @@ class ImageManager:
             return '.bmp'
         
         # Default to .jpg if we can't determine
-        logger.debug(f"Could not determine extension from URL {url}, using default .jpg")
+        logger.debug("Could not determine extension from URL %s, using default .jpg", url)
         return '.jpg'
     
     def download_pending_images(self, session: requests.Session) -> None:
-        """Download all pending images using the provided session."""
+        """Download all pending images concurrently using the provided session."""
         if not self.pending_images:
             return
             
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Fetch each target path once, even if several URLs map to it
+        urls_by_path: Dict[Path, List[str]] = {}
         for url, path in self.pending_images:
-            try:
-                if not path.exists():  # Skip if already downloaded
-                    response = session.get(url, timeout=30)
-                    response.raise_for_status()
-                    
-                    # Check content type and adjust extension if needed
-                    content_type = response.headers.get('content-type')
-                    if content_type:
-                        correct_ext = self._get_extension(url, content_type)
-                        if path.suffix.lower() != correct_ext:
-                            # Update path with correct extension
-                            path = path.with_suffix(correct_ext)
-                    
-                    path.write_bytes(response.content)
-                    logger.info(f"Downloaded image: {path.name}")
-                    
-                self.downloaded_images[url] = path
-                
-            except requests.RequestException as e:
-                logger.error(f"Failed to download image {url}: {str(e)}")
-                continue
+            urls_by_path.setdefault(path, []).append(url)
+        
+        workers = min(MAX_DOWNLOAD_WORKERS, len(urls_by_path))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda item: self._download_image(session, item[1][0], item[0]),
+                urls_by_path.items()
+            )
+            for urls, path in zip(urls_by_path.values(), results):
+                if path is not None:
+                    for url in urls:
+                        self.downloaded_images[url] = path
             
         self.pending_images.clear()
     
-    def extract_image_links(self, driver: WebDriver, url: str) -> Tuple[Optional[str], Optional[str]]:
+    def _download_image(self, session: requests.Session, url: str, path: Path) -> Optional[Path]:
+        """
+        Download one image unless it already exists.
+        
+        Returns:
+            Final path of the image, or None if the download failed
+        """
+        if path.exists():  # Skip if already downloaded
+            return path
+            
+        try:
+            response = session.get(url, timeout=30)
+            response.raise_for_status()
+            
+            # Check content type and adjust extension if needed
+            content_type = response.headers.get('content-type')
+            if content_type:
+                correct_ext = self._get_extension(url, content_type)
+                if path.suffix.lower() != correct_ext:
+                    # Update path with correct extension
+                    path = path.with_suffix(correct_ext)
+            
+            path.write_bytes(response.content)
+            logger.debug("Downloaded image: %s", path.name)
+            return path
+            
+        except requests.RequestException as e:
+            logger.error(f"Failed to download image {url}: {str(e)}")
+            return None
+    
+    def extract_image_links(self, driver: 'WebDriver', url: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Extract direct image link from Box preview page.
         
@@ -167,6 +207,11 @@ class ImageManager:
         Returns:
             Direct image URL if found, None otherwise
         """
+        # Selenium is only needed for browser-based downloads
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.common.by import By
+
         try:
             driver.get(url)
             time.sleep(2)  # Wait for page load
@@ -0,0 +1,85 @@
+"""Tests for directory conversion in BoxNoteConverter."""
+from pathlib import Path
+from typing import List
+
+import orjson
+import pytest
+from click.testing import CliRunner
+from docx import Document
+
+import boxtodocx.convertor as convertor
+from boxtodocx.cli import main
+from boxtodocx.convertor import BoxNoteConverter
+
+
+def write_boxnote(path: Path, text: str) -> None:
+    """Write a minimal Box note holding a single paragraph of text."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps({
+        "doc": {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+            ]
+        }
+    }))
+
+
+def docx_text(path: Path) -> List[str]:
+    """Return the paragraph texts of a DOCX file."""
+    return [p.text for p in Document(str(path)).paragraphs]
+
+
+@pytest.fixture
+def notes(tmp_path):
+    """Create a tree of Box notes and return them in the order they are walked."""
+    root = tmp_path / "notes"
+    for name in ("a", "b", "c", "sub/d", "sub/e"):
+        path = root / f"{name}.boxnote"
+        write_boxnote(path, f"text of {path.stem}")
+    return root, list(convertor._iter_boxnotes(root))
+
+
+def test_parallel_results_match_serial_in_input_order(tmp_path, notes):
+    root, boxnotes = notes
+    converter = BoxNoteConverter(tmp_path / "out")
+    expected = [path.with_suffix(".docx") for path in boxnotes]
+
+    parallel = converter.convert_directory(root, generate_html=False, jobs=2)
+    assert [docx_path for _, docx_path, _ in parallel] == expected
+    parallel_text = [docx_text(path) for path in expected]
+    assert parallel_text == [[f"text of {path.stem}"] for path in boxnotes]
+
+    serial = converter.convert_directory(root, generate_html=False, jobs=1)
+    assert serial == parallel
+    assert [docx_text(path) for path in expected] == parallel_text
+
+
+def test_browser_image_export_stays_serial(tmp_path, notes, monkeypatch):
+    root, boxnotes = notes
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("browser image export must not use a process pool")
+
+    monkeypatch.setattr(convertor, "ProcessPoolExecutor", no_pool)
+    # The notes have no images, so the browser is never started
+    results = BoxNoteConverter(tmp_path / "out").convert_directory(
+        root,
+        credentials={"user_id": "user", "password": "secret"},
+        generate_html=False,
+        export_images=True,
+        jobs=2
+    )
+    assert [docx_path for _, docx_path, _ in results] == [
+        path.with_suffix(".docx") for path in boxnotes
+    ]
+
+
+def test_cli_jobs_option_converts_directory(tmp_path, notes):
+    root, boxnotes = notes
+    result = CliRunner().invoke(
+        main, [str(root), "--directory", "--jobs", "2", "--dest-dir", str(tmp_path / "out")]
+    )
+    assert result.exit_code == 0, result.output
+    for path in boxnotes:
+        assert docx_text(path.with_suffix(".docx")) == [f"text of {path.stem}"]
@@ -0,0 +1,168 @@
+"""Tests for the HTML to DOCX handler."""
+from pathlib import Path
+
+import pytest
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import RGBColor
+from PIL import Image
+
+from boxtodocx.handlers.docx_handler import DOCXHandler
+
+
+def convert(tmp_path: Path, body: str) -> Document:
+    """Convert an HTML body with a fresh handler and reopen the saved DOCX."""
+    output_path = tmp_path / "out.docx"
+    DOCXHandler().convert_html_to_docx(
+        f"<html><body>{body}</body></html>", output_path, tmp_path
+    )
+    return Document(str(output_path))
+
+
+def runs(paragraph):
+    """Return the <w:r> elements directly inside a paragraph."""
+    return paragraph._p.findall(qn("w:r"))
+
+
+def drawings(paragraph):
+    """Return the <w:drawing> elements inside a paragraph's runs."""
+    return paragraph._p.findall(f"{qn('w:r')}/{qn('w:drawing')}")
+
+
+@pytest.fixture
+def image(tmp_path):
+    """Write a small PNG under images/ and return its path relative to tmp_path."""
+    (tmp_path / "images").mkdir()
+    Image.new("RGB", (10, 10), "red").save(tmp_path / "images" / "pic.png")
+    return "images/pic.png"
+
+
+def texts(run):
+    """Return the text of each <w:t> in a run."""
+    return [t.text for t in run.findall(qn("w:t"))]
+
+
+class TestRunMerging:
+    """Adjacent text with the same formatting shares a run."""
+
+    def test_same_format_text_merges_into_one_run(self, tmp_path):
+        doc = convert(tmp_path, "<p><strong>a</strong><strong>b</strong></p>")
+        (run,) = runs(doc.paragraphs[0])
+        assert texts(run) == ["a", "b"]
+        assert doc.paragraphs[0].runs[0].bold
+
+    def test_different_format_starts_new_run(self, tmp_path):
+        doc = convert(tmp_path, "<p><strong>a</strong><em>b</em></p>")
+        assert [texts(run) for run in runs(doc.paragraphs[0])] == [["a"], ["b"]]
+
+    @pytest.mark.parametrize("text", ["x\ty", "x\ny"])
+    def test_text_with_tab_or_newline_starts_new_run(self, tmp_path, text):
+        doc = convert(tmp_path, f"<p><strong>a</strong><strong>{text}</strong></p>")
+        first, second = runs(doc.paragraphs[0])
+        assert texts(first) == ["a"]
+        assert second.find(qn("w:tab")) is not None or second.find(qn("w:br")) is not None
+        assert doc.paragraphs[0].runs[1].bold
+
+    def test_hyperlink_stops_merge(self, tmp_path):
+        doc = convert(tmp_path, '<p>a<a href="https://example.com">link</a>b</p>')
+        p = doc.paragraphs[0]._p
+        assert [child.tag for child in p if child.tag != qn("w:pPr")] == [
+            qn("w:r"), qn("w:hyperlink"), qn("w:r")
+        ]
+        assert [texts(run) for run in runs(doc.paragraphs[0])] == [["a"], ["b"]]
+
+    def test_line_break_stops_merge(self, tmp_path):
+        doc = convert(tmp_path, "<p>a<br/>b</p>")
+        paragraph_runs = runs(doc.paragraphs[0])
+        assert len(paragraph_runs) == 3
+        assert texts(paragraph_runs[0]) == ["a"]
+        assert paragraph_runs[1].find(qn("w:br")) is not None
+        assert texts(paragraph_runs[2]) == ["b"]
+
+    def test_new_paragraph_never_merges(self, tmp_path):
+        doc = convert(tmp_path, "<p>a</p><p>b</p>")
+        assert [p.text for p in doc.paragraphs] == ["a", "b"]
+        assert [len(runs(p)) for p in doc.paragraphs] == [1, 1]
+
+    def test_table_cells_never_merge(self, tmp_path):
+        doc = convert(tmp_path, "<p>a</p><table><tr><td>b</td><td>c</td></tr></table>")
+        assert doc.paragraphs[0].text == "a"
+        cells = doc.tables[0].rows[0].cells
+        assert [cell.text for cell in cells] == ["b", "c"]
+        assert [len(runs(cell.paragraphs[0])) for cell in cells] == [1, 1]
+
+
+class TestImages:
+    """Images are placed inline inside paragraphs and as blocks elsewhere."""
+
+    def test_image_inside_paragraph_is_inline(self, tmp_path, image):
+        doc = convert(tmp_path, f'<p>before<img src="{image}"/>after</p>')
+        assert len(doc.paragraphs) == 1
+        paragraph = doc.paragraphs[0]
+        assert paragraph.text == "beforeafter"
+        assert len(drawings(paragraph)) == 1
+        # The picture sits between the two text runs
+        assert [bool(run.findall(qn("w:drawing"))) for run in runs(paragraph)] == [
+            False, True, False
+        ]
+
+    def test_top_level_image_gets_own_paragraph_and_spacer(self, tmp_path, image):
+        doc = convert(tmp_path, f'<p>a</p><img src="{image}"/><p>b</p>')
+        assert [p.text for p in doc.paragraphs] == ["a", "", "", "b"]
+        assert [len(drawings(p)) for p in doc.paragraphs] == [0, 1, 0, 0]
+
+    def test_missing_image_is_skipped(self, tmp_path):
+        doc = convert(tmp_path, '<p>a<img src="images/missing.png"/></p>')
+        assert doc.paragraphs[0].text == "a"
+        assert not drawings(doc.paragraphs[0])
+
+
+class TestContainers:
+    """Content of block wrappers without a handler reaches the document."""
+
+    @pytest.mark.parametrize("tag", ["blockquote", "div", "section"])
+    def test_container_content_is_converted(self, tmp_path, tag):
+        doc = convert(tmp_path, f"<{tag}><p>inside</p></{tag}>")
+        assert [p.text for p in doc.paragraphs] == ["inside"]
+
+    def test_nested_containers_keep_document_order(self, tmp_path):
+        doc = convert(
+            tmp_path,
+            "<p>a</p><div><blockquote><p>b</p><ul><li>c</li></ul></blockquote>"
+            "<p>d</p></div><p>e</p>",
+        )
+        assert [p.text for p in doc.paragraphs] == ["a", "b", "c", "d", "e"]
+
+
+class TestNestedFormatting:
+    """Formatting from every enclosing inline tag applies to the text."""
+
+    def test_nested_bold_italic_underline(self, tmp_path):
+        doc = convert(tmp_path, "<p><strong><em><u>x</u></em></strong></p>")
+        (run,) = doc.paragraphs[0].runs
+        assert (run.bold, run.italic, run.underline) == (True, True, True)
+
+    def test_color_span_around_underline(self, tmp_path):
+        doc = convert(tmp_path, '<p><span style="color: #ff0000"><u>red</u></span></p>')
+        (run,) = doc.paragraphs[0].runs
+        assert run.underline
+        assert run.font.color.rgb == RGBColor(0xFF, 0x00, 0x00)
+
+    def test_underline_around_color_span(self, tmp_path):
+        doc = convert(tmp_path, '<p><u><span style="color:#00ff00">green</span></u></p>')
+        (run,) = doc.paragraphs[0].runs
+        assert run.underline
+        assert run.font.color.rgb == RGBColor(0x00, 0xFF, 0x00)
+
+    def test_innermost_color_wins(self, tmp_path):
+        doc = convert(
+            tmp_path,
+            '<p><span style="color:#ff0000"><span style="color:#0000ff">x</span></span></p>',
+        )
+        (run,) = doc.paragraphs[0].runs
+        assert run.font.color.rgb == RGBColor(0x00, 0x00, 0xFF)
+
+    def test_formatting_does_not_leak_to_siblings(self, tmp_path):
+        doc = convert(tmp_path, "<p><strong><em>a</em>b</strong>c</p>")
+        formats = [(run.text, run.bold, run.italic) for run in doc.paragraphs[0].runs]
+        assert formats == [("a", True, True), ("b", True, None), ("c", None, None)]